@@ -1,6 +1,7 @@
 import streamlit as st
 import os
 import asyncio
+from functools import lru_cache
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_chroma import Chroma
 
@@ -20,6 +21,54 @@ def _ensure_event_loop():
         asyncio.set_event_loop(loop)
 
 
+@lru_cache(maxsize=None)
+def get_embeddings():
+    """
+    Returns the embeddings client, shared across calls.
+
+    Returns:
+        GoogleGenerativeAIEmbeddings: The cached embeddings client.
+    """
+    # FIX: Use settings.GOOGLE_API_KEY instead of hard-coded key
+    return GoogleGenerativeAIEmbeddings(
+        model=settings.EMBEDDING_MODEL_NAME,
+        google_api_key=settings.GOOGLE_API_KEY,
+    )
+
+
+def build_vectorstore_from_text(text_content: str):
+    """
+    Splits, embeds and persists raw text content, overwriting any existing store.
+
+    Unlike create_vectorstore_from_text, errors are raised to the caller
+    rather than reported through Streamlit.
+
+    Args:
+        text_content (str): The raw text to index.
+
+    Returns:
+        Chroma: The Chroma vector store.
+    """
+    _ensure_event_loop()
+
+    # Wrap the raw text in a LangChain Document object
+    documents = [Document(page_content=text_content)]
+
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=settings.CHUNK_SIZE, chunk_overlap=settings.CHUNK_OVERLAP
+    )
+    document_chunks = text_splitter.split_documents(documents)
+
+    embeddings = get_embeddings()
+
+    # Create and persist the vector store
+    return Chroma.from_documents(
+        document_chunks,
+        embeddings,
+        persist_directory=settings.CHROMA_PERSIST_DIRECTORY,
+    )
+
+
 def create_vectorstore_from_text(text_content: str):
     """
     Creates a new vector store from raw text content, overwriting any existing one.
@@ -30,35 +79,12 @@ def create_vectorstore_from_text(text_content: str):
     Returns:
         Chroma: The Chroma vector store, or None on failure.
     """
-    _ensure_event_loop()
-
     if not text_content:
         st.warning("The uploaded file appears to be empty.")
         return None
 
     try:
-        # Wrap the raw text in a LangChain Document object
-        documents = [Document(page_content=text_content)]
-
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.CHUNK_SIZE, chunk_overlap=settings.CHUNK_OVERLAP
-        )
-        document_chunks = text_splitter.split_documents(documents)
-
-        # FIX: Use settings.GOOGLE_API_KEY instead of hard-coded key
-        embeddings = GoogleGenerativeAIEmbeddings(
-            model=settings.EMBEDDING_MODEL_NAME,
-            google_api_key=settings.GOOGLE_API_KEY,
-        )
-
-        # Create and persist the vector store
-        vector_store = Chroma.from_documents(
-            document_chunks,
-            embeddings,
-            persist_directory=settings.CHROMA_PERSIST_DIRECTORY,
-        )
-
-        return vector_store
+        return build_vectorstore_from_text(text_content)
     except Exception as e:
         st.error(f"An error occurred while creating the vector store: {e}")
         return None
@@ -77,11 +103,7 @@ def get_vectorstore():
         return None
 
     try:
-        # FIX: Use settings.GOOGLE_API_KEY instead of hard-coded key
-        embeddings = GoogleGenerativeAIEmbeddings(
-            model=settings.EMBEDDING_MODEL_NAME,
-            google_api_key=settings.GOOGLE_API_KEY,
-        )
+        embeddings = get_embeddings()
         vector_store = Chroma(
             persist_directory=settings.CHROMA_PERSIST_DIRECTORY,
             embedding_function=embeddings,
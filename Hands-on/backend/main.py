@@ -2,26 +2,41 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_classic.chains import create_history_aware_retriever, create_retrieval_chain
 from langchain_classic.chains.combine_documents import create_stuff_documents_chain
+from functools import lru_cache
 from backend.config import settings
 
 
-def get_context_retriever_chain(vector_store, model_name):
+@lru_cache(maxsize=None)
+def get_llm(model_name):
     """
-    Creates a retriever chain that is aware of the conversation history.
+    Returns the chat model client for a model name, shared across calls.
 
     Args:
-        vector_store (Chroma): The vector store containing document embeddings.
         model_name (str): The name of the model to use.
 
     Returns:
-        RetrievalChain: The history-aware retriever chain.
+        ChatGoogleGenerativeAI: The cached chat model client.
     """
     # FIX: Use settings.GOOGLE_API_KEY and updated model name
-    llm = ChatGoogleGenerativeAI(
+    return ChatGoogleGenerativeAI(
         model=model_name,
         google_api_key=settings.GOOGLE_API_KEY,
     )
 
+
+def get_context_retriever_chain(vector_store, model_name):
+    """
+    Creates a retriever chain that is aware of the conversation history.
+
+    Args:
+        vector_store (Chroma): The vector store containing document embeddings.
+        model_name (str): The name of the model to use.
+
+    Returns:
+        RetrievalChain: The history-aware retriever chain.
+    """
+    llm = get_llm(model_name)
+
     retriever = vector_store.as_retriever()
 
     prompt = ChatPromptTemplate.from_messages(
@@ -50,11 +65,7 @@ def get_conversational_rag_chain(retriever_chain, model_name):
     Returns:
         RetrievalChain: The conversational RAG chain.
     """
-    # FIX: Use settings.GOOGLE_API_KEY and updated model name
-    llm = ChatGoogleGenerativeAI(
-        model=model_name,
-        google_api_key=settings.GOOGLE_API_KEY,
-    )
+    llm = get_llm(model_name)
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -72,22 +83,17 @@ def get_conversational_rag_chain(retriever_chain, model_name):
     return create_retrieval_chain(retriever_chain, stuff_documents_chain)
 
 
-def get_llm_only_response(user_input, chat_history, model_name):
+def get_llm_only_chain(model_name):
     """
-    Gets a response using only the LLM without RAG.
+    Creates a chain that answers from the LLM's general knowledge only.
 
     Args:
-        user_input (str): The user's question.
-        chat_history (list): The conversation history.
         model_name (str): The name of the model to use.
 
     Returns:
-        str: The generated answer from the LLM.
+        RunnableSequence: The prompt piped into the LLM.
     """
-    llm = ChatGoogleGenerativeAI(
-        model=model_name,
-        google_api_key=settings.GOOGLE_API_KEY,
-    )
+    llm = get_llm(model_name)
 
     # Create a simple prompt for LLM-only responses
     prompt = ChatPromptTemplate.from_messages(
@@ -101,7 +107,22 @@ def get_llm_only_response(user_input, chat_history, model_name):
         ]
     )
 
-    chain = prompt | llm
+    return prompt | llm
+
+
+def get_llm_only_response(user_input, chat_history, model_name):
+    """
+    Gets a response using only the LLM without RAG.
+
+    Args:
+        user_input (str): The user's question.
+        chat_history (list): The conversation history.
+        model_name (str): The name of the model to use.
+
+    Returns:
+        str: The generated answer from the LLM.
+    """
+    chain = get_llm_only_chain(model_name)
     
     response = chain.invoke(
         {"chat_history": chat_history, "input": user_input}
@@ -136,4 +157,33 @@ def get_response(user_input, vector_store, chat_history, model_name, rag_enabled
         return response.get("answer", "Sorry, I could not find an answer.")
     else:
         # Use LLM only without RAG
-        return get_llm_only_response(user_input, chat_history, model_name)
\ No newline at end of file
+        return get_llm_only_response(user_input, chat_history, model_name)
+
+
+def stream_response(user_input, vector_store, chat_history, model_name, rag_enabled=True):
+    """
+    Streams a response from either the conversational RAG chain or LLM only.
+
+    Takes the same arguments as get_response, but yields the answer in
+    pieces as the model produces them.
+
+    Yields:
+        str: The next piece of the generated answer.
+    """
+    if rag_enabled and vector_store:
+        retriever_chain = get_context_retriever_chain(vector_store, model_name)
+        conversation_rag_chain = get_conversational_rag_chain(retriever_chain, model_name)
+
+        for chunk in conversation_rag_chain.stream(
+            {"chat_history": chat_history, "input": user_input}
+        ):
+            if chunk.get("answer"):
+                yield chunk["answer"]
+    else:
+        chain = get_llm_only_chain(model_name)
+
+        for chunk in chain.stream(
+            {"chat_history": chat_history, "input": user_input}
+        ):
+            if chunk.content:
+                yield chunk.content
\ No newline at end of file
@@ -0,0 +1,163 @@
+import csv
+import os
+import random
+
+# Roughly how many new characters each chunk contributes once the
+# splitter's overlap is taken into account (CHUNK_SIZE - CHUNK_OVERLAP).
+CHARS_PER_CHUNK = 800
+
+SCALES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+VOCABULARY = [
+    "market", "share", "revenue", "growth", "competitor", "pricing", "segment",
+    "customer", "retention", "churn", "forecast", "quarter", "industry", "trend",
+    "demand", "supply", "margin", "acquisition", "strategy", "brand", "channel",
+    "regional", "enterprise", "consumer", "adoption", "subscription", "platform",
+    "analytics", "logistics", "partnership", "expansion", "regulation", "survey",
+    "benchmark", "innovation", "startup", "incumbent", "valuation", "portfolio",
+    "emerging", "sustainability", "automation", "cloud", "retail", "wholesale",
+]
+
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell"]
+
+
+class CorpusGenerator:
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+
+    def sentence(self):
+        words = self.random.choices(VOCABULARY, k=self.random.randint(8, 16))
+        company = self.random.choice(COMPANIES)
+        return f"{company} {' '.join(words)}."
+
+    def text(self, target_chunks):
+        target_chars = target_chunks * CHARS_PER_CHUNK
+        paragraphs = []
+        size = 0
+        while size < target_chars:
+            paragraph = " ".join(self.sentence() for _ in range(self.random.randint(4, 8)))
+            paragraphs.append(paragraph)
+            size += len(paragraph) + 2
+        return "\n\n".join(paragraphs)
+
+    def write_text(self, path, target_chunks):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.text(target_chunks))
+        return path
+
+    def write_csv(self, path, target_chunks):
+        target_chars = target_chunks * CHARS_PER_CHUNK
+        size = 0
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["company", "quarter", "revenue", "share", "notes"])
+            while size < target_chars:
+                row = [
+                    self.random.choice(COMPANIES),
+                    f"Q{self.random.randint(1, 4)}",
+                    str(self.random.randint(1_000, 9_000_000)),
+                    f"{self.random.random():.3f}",
+                    self.sentence(),
+                ]
+                writer.writerow(row)
+                size += sum(len(cell) for cell in row) + len(row)
+        return path
+
+    def write_pdf(self, path, target_chunks, lines_per_page=60):
+        lines = []
+        for paragraph in self.text(target_chunks).split("\n\n"):
+            lines.extend(_wrap(paragraph, 90))
+        pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+        _write_minimal_pdf(path, pages)
+        return path
+
+    def queries(self, count):
+        return [
+            f"What does the {self.random.choice(VOCABULARY)} {self.random.choice(VOCABULARY)} "
+            f"data say about {self.random.choice(COMPANIES)}?"
+            for _ in range(count)
+        ]
+
+
+def build_corpus(directory, total_chunks, seed=0):
+    """
+    Writes a PDF, a CSV and a text file that together split into roughly
+    `total_chunks` chunks.
+
+    Returns:
+        dict: Mapping of format name ("pdf", "csv", "txt") to file path.
+    """
+    generator = CorpusGenerator(seed)
+    per_format = max(1, total_chunks // 3)
+    return {
+        "pdf": generator.write_pdf(os.path.join(directory, "corpus.pdf"), per_format),
+        "csv": generator.write_csv(os.path.join(directory, "corpus.csv"), per_format),
+        "txt": generator.write_text(os.path.join(directory, "corpus.txt"), per_format),
+    }
+
+
+def _wrap(paragraph, width):
+    lines = []
+    current = ""
+    for word in paragraph.split():
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _escape_pdf_text(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _write_minimal_pdf(path, pages):
+    """Writes an uncompressed PDF with one Helvetica text stream per page."""
+    page_count = max(1, len(pages))
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then (page, content) pairs.
+    page_ids = [4 + 2 * i for i in range(page_count)]
+    offsets = []
+
+    with open(path, "wb") as file:
+        def write_object(number, body):
+            offsets.append(file.tell())
+            file.write(f"{number} 0 obj\n".encode("latin-1"))
+            file.write(body)
+            file.write(b"\nendobj\n")
+
+        file.write(b"%PDF-1.4\n")
+        write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+        write_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode("latin-1"))
+        write_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+        for page_id, lines in zip(page_ids, pages or [[]]):
+            write_object(
+                page_id,
+                (
+                    f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                    f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+                ).encode("latin-1"),
+            )
+            text = "".join(f"({_escape_pdf_text(line)}) Tj T* " for line in lines)
+            stream = f"BT /F1 9 Tf 11 TL 40 760 Td {text}ET".encode("latin-1")
+            write_object(
+                page_id + 1,
+                f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream",
+            )
+
+        xref_offset = file.tell()
+        file.write(f"xref\n0 {len(offsets) + 1}\n".encode("latin-1"))
+        file.write(b"0000000000 65535 f \n")
+        for offset in offsets:
+            file.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+        file.write(
+            f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1")
+        )
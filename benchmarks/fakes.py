@@ -0,0 +1,89 @@
+import contextlib
+import math
+import os
+import sys
+import zlib
+from unittest import mock
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HANDS_ON_DIR = os.path.join(REPO_ROOT, "Hands-on")
+ANALYZER_DIR = os.path.join(REPO_ROOT, "market_research_analyzer")
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embeddings that never touch the network.
+
+    Each token is hashed into one of `dimensions` buckets and the resulting
+    count vector is L2-normalised, so texts sharing words still land close
+    together and retrieval results are stable across runs.
+    """
+
+    def __init__(self, dimensions=384):
+        self.dimensions = dimensions
+
+    def _embed(self, text):
+        vector = [0.0] * self.dimensions
+        for token in text.lower().split():
+            vector[zlib.crc32(token.encode("utf-8")) % self.dimensions] += 1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def fake_chat_model(model=None, **kwargs):
+    """Stands in for ChatGoogleGenerativeAI with a fixed, deterministic reply."""
+    return FakeListChatModel(responses=[f"Synthetic answer from {model or 'fake-model'}."])
+
+
+def fake_embeddings(*args, **kwargs):
+    return HashingEmbeddings()
+
+
+@contextlib.contextmanager
+def offline_apps(persist_directory):
+    """
+    Makes both apps importable and swaps every network-backed model for a fake.
+
+    The Hands-on backend and the analyzer's `src` package are imported from
+    their own directories, their Chroma stores are pointed at
+    `persist_directory`, and Google/HuggingFace models are replaced with
+    `HashingEmbeddings` and `fake_chat_model`.
+    """
+    for path in (HANDS_ON_DIR, ANALYZER_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+    import backend.db_manager
+    import backend.main
+    import config
+    import src.vector_store
+    from backend.config import settings
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.object(backend.main, "ChatGoogleGenerativeAI", fake_chat_model))
+        stack.enter_context(
+            mock.patch.object(backend.db_manager, "GoogleGenerativeAIEmbeddings", fake_embeddings)
+        )
+        stack.enter_context(mock.patch.object(src.vector_store, "HuggingFaceEmbeddings", fake_embeddings))
+        stack.enter_context(
+            mock.patch.object(
+                settings, "CHROMA_PERSIST_DIRECTORY", os.path.join(persist_directory, "hands_on")
+            )
+        )
+        stack.enter_context(
+            mock.patch.object(
+                config.Config, "PERSIST_DIRECTORY", os.path.join(persist_directory, "analyzer")
+            )
+        )
+        yield
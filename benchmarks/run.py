@@ -0,0 +1,326 @@
+"""
+Offline benchmark suite for both apps.
+
+Generates a synthetic PDF/CSV/text corpus, runs the real ingestion and query
+code paths against deterministic fake embedders and LLMs, and writes the
+results as JSON. The analyzer store is also exported to a snapshot to report
+its size, bulk-import rate and cold-start time next to Chroma's own. Run from
+the repository root:
+
+    python -m benchmarks.run --scale 1k --output bench.json
+    python -m benchmarks.run --scale 1k --baseline bench.json
+
+Parse and ingest cases report the median of --repeats runs after a warm-up.
+Peak RSS is only reported for the whole process, since ru_maxrss is a
+high-water mark; run one scale per invocation.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.corpus import SCALES, CorpusGenerator, build_corpus
+from benchmarks.fakes import offline_apps
+
+SCHEMA_VERSION = 1
+
+# Timed runs per parse/ingest case; ingesting 1M chunks takes hours per run.
+DEFAULT_REPEATS = {"1k": 5, "100k": 3, "1m": 1}
+
+# Metric name suffixes and whether larger values are better.
+HIGHER_IS_BETTER = ("_per_s",)
+LOWER_IS_BETTER = ("_ms", "_mb")
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+
+    def pick(fraction):
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    return {
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "mean_ms": sum(ordered) / len(ordered),
+    }
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def timed_median(function, repeats, setup=None):
+    """
+    Calls `function` once as a warm-up and then `repeats` more times.
+
+    `setup`, if given, runs untimed before every call and its result is
+    passed to `function`; use it to hand each run a fresh store directory.
+
+    Returns:
+        tuple: The last call's result and the median elapsed seconds.
+    """
+    samples = []
+    result = None
+    for attempt in range(repeats + 1):
+        args = (setup(attempt),) if setup else ()
+        result, elapsed = timed(function, *args)
+        if attempt:  # the first call is the warm-up
+            samples.append(elapsed)
+    return result, statistics.median(samples)
+
+
+def bench_parsing(metrics, paths, repeats):
+    from src.document_processor import DocumentProcessor
+
+    processor = DocumentProcessor()
+    documents = []
+    for kind, path in paths.items():
+        if kind == "pdf":
+            chunks, elapsed = timed_median(lambda: processor.process_pdf(path), repeats)
+        elif kind == "csv":
+            chunks, elapsed = timed_median(lambda: processor.process_csv(path), repeats)
+        else:
+            with open(path, encoding="utf-8") as file:
+                text = file.read()
+            source = os.path.basename(path)
+            chunks, elapsed = timed_median(lambda: processor.process_text(text, source=source), repeats)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        metrics[f"parse.{kind}.chunks"] = len(chunks)
+        metrics[f"parse.{kind}.chunks_per_s"] = len(chunks) / elapsed
+        metrics[f"parse.{kind}.mb_per_s"] = size_mb / elapsed
+        documents.extend(chunks)
+    return documents
+
+
+def bench_ingestion(metrics, documents, text_path, stores_dir, repeats):
+    from chromadb.api.client import SharedSystemClient
+    from backend.config import settings
+    from backend.db_manager import create_vectorstore_from_text
+    from config import Config
+    from src.vector_store import VectorStoreManager
+
+    # Every run writes into its own directory so no run appends to another's
+    # collection, and the previous run's store is deleted so only the last one
+    # is kept for the query and snapshot phases. offline_apps restores both
+    # settings on exit.
+    def fresh_directory(name, attempt):
+        if attempt:
+            # Chroma keeps one client per path alive; drop them before deleting.
+            SharedSystemClient.clear_system_cache()
+            shutil.rmtree(os.path.join(stores_dir, f"{name}-{attempt - 1}"), ignore_errors=True)
+        return os.path.join(stores_dir, f"{name}-{attempt}")
+
+    def fresh_manager(attempt):
+        Config.PERSIST_DIRECTORY = fresh_directory("analyzer", attempt)
+        return VectorStoreManager()
+
+    def fresh_hands_on_store(attempt):
+        settings.CHROMA_PERSIST_DIRECTORY = fresh_directory("hands_on", attempt)
+
+    manager = None
+
+    def add_documents(new_manager):
+        nonlocal manager
+        manager = new_manager
+        manager.add_documents(documents)
+
+    _, elapsed = timed_median(add_documents, repeats, setup=fresh_manager)
+    metrics["ingest.vector_store_manager.chunks"] = len(documents)
+    metrics["ingest.vector_store_manager.chunks_per_s"] = len(documents) / elapsed
+
+    with open(text_path, encoding="utf-8") as file:
+        text = file.read()
+
+    def create_store(_):
+        vector_store = create_vectorstore_from_text(text)
+        # Failures are only reported through st.error, so check every run
+        # rather than letting a failed run's short timing skew the median.
+        if vector_store is None:
+            raise RuntimeError("create_vectorstore_from_text failed; see the error logged above.")
+        return vector_store
+
+    vector_store, elapsed = timed_median(create_store, repeats, setup=fresh_hands_on_store)
+    count = vector_store._collection.count()
+    metrics["ingest.create_vectorstore_from_text.chunks"] = count
+    metrics["ingest.create_vectorstore_from_text.chunks_per_s"] = count / elapsed
+    return manager, vector_store
+
+
+def bench_queries(metrics, manager, vector_store, queries):
+    from langchain_core.messages import AIMessage, HumanMessage
+    from backend.main import get_response
+    from src.chat_engine import ChatEngine
+
+    engine = ChatEngine(manager.get_retriever())
+    chat_history = [HumanMessage(content="Hi"), AIMessage(content="Hello! Ask me anything.")]
+    cases = {
+        "chat_engine.ask_question": lambda q: engine.ask_question(q),
+        "get_response.rag": lambda q: get_response(q, vector_store, chat_history, "fake-model", True),
+        "get_response.llm_only": lambda q: get_response(q, vector_store, chat_history, "fake-model", False),
+    }
+    for name, call in cases.items():
+        call(queries[0])  # warm-up, excluded from the samples
+        samples = []
+        for query in queries:
+            _, elapsed = timed(call, query)
+            samples.append(elapsed * 1000)
+        for key, value in percentiles(samples).items():
+            metrics[f"query.{name}.{key}"] = value
+
+
+def _directory_size_mb(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / (1024 * 1024)
+
+
+def bench_snapshot(metrics, manager, workdir, query):
+    from langchain_chroma import Chroma
+    from snapshot.cli import chroma_cold_start, cold_start
+    from snapshot.store import SnapshotVectorStore, export_collection, import_snapshot
+
+    snapshot_path = os.path.join(workdir, "analyzer.ragsnap")
+    stats = export_collection(manager.persist_directory, snapshot_path)
+    metrics["snapshot.export.rows_per_s"] = stats["count"] / stats["seconds"]
+    metrics["snapshot.size_mb"] = stats["size_bytes"] / (1024 * 1024)
+    metrics["snapshot.chroma_size_mb"] = _directory_size_mb(manager.persist_directory)
+
+    # A fresh interpreter opening the snapshot, or the Chroma store it came
+    # from, and running one search. Both were just written, so the OS page
+    # cache is likely still warm, and neither figure includes import time.
+    metrics["snapshot.cold_start_ms"] = cold_start(snapshot_path)["cold_start_ms"]
+    metrics["snapshot.chroma_cold_start_ms"] = chroma_cold_start(manager.persist_directory)["cold_start_ms"]
+
+    # In-process figures: the snapshot's pages and Chroma's cached client for
+    # this path are both warm here, so these are labelled as such.
+    start = time.perf_counter()
+    SnapshotVectorStore.load(snapshot_path, manager.embeddings).similarity_search(query, k=4)
+    metrics["snapshot.warm_start_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    Chroma(
+        persist_directory=manager.persist_directory,
+        embedding_function=manager.embeddings,
+    ).similarity_search(query, k=4)
+    metrics["snapshot.chroma_warm_reopen_ms"] = (time.perf_counter() - start) * 1000
+
+    stats = import_snapshot(snapshot_path, os.path.join(workdir, "imported"))
+    metrics["snapshot.import.rows_per_s"] = stats["count"] / stats["seconds"]
+
+
+def run(scale, queries, seed, repeats):
+    metrics = {}
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        corpus_dir = os.path.join(workdir, "corpus")
+        os.makedirs(corpus_dir)
+        paths, elapsed = timed(build_corpus, corpus_dir, SCALES[scale], seed)
+        metrics["corpus.generate_s"] = elapsed
+
+        stores_dir = os.path.join(workdir, "stores")
+        with offline_apps(stores_dir):
+            documents = bench_parsing(metrics, paths, repeats)
+            manager, vector_store = bench_ingestion(metrics, documents, paths["txt"], stores_dir, repeats)
+            query_set = CorpusGenerator(seed).queries(queries)
+            bench_queries(metrics, manager, vector_store, query_set)
+            bench_snapshot(metrics, manager, workdir, query_set[0])
+
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    return {
+        "schema": SCHEMA_VERSION,
+        "scale": scale,
+        "target_chunks": SCALES[scale],
+        "queries": queries,
+        "repeats": repeats,
+        "seed": seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": metrics,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares `results` against `baseline` and lists the metrics that got worse
+    by more than `tolerance` (a fraction, e.g. 0.2 for 20%).
+
+    Metrics without a recognised direction suffix (counts, setup times) are
+    skipped.
+    """
+    if baseline.get("scale") != results["scale"]:
+        raise ValueError(
+            f"Baseline scale {baseline.get('scale')!r} does not match run scale {results['scale']!r}."
+        )
+    regressions = []
+    for name, old in baseline["metrics"].items():
+        new = results["metrics"].get(name)
+        if new is None or not old:
+            continue
+        change = (new - old) / old
+        if name.endswith(HIGHER_IS_BETTER) and change < -tolerance:
+            regressions.append((name, old, new, change))
+        elif name.endswith(LOWER_IS_BETTER) and change > tolerance:
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline ingestion and retrieval benchmarks.")
+    parser.add_argument("--scale", choices=list(SCALES), default="1k", help="Approximate corpus size in chunks.")
+    parser.add_argument("--queries", type=positive_int, default=50, help="Queries per latency benchmark.")
+    parser.add_argument(
+        "--repeats", type=positive_int,
+        help="Timed runs per parse/ingest case after one warm-up; the median is reported "
+        "(default: 5 for 1k, 3 for 100k, 1 for 1m).",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic corpus and queries.")
+    parser.add_argument("--output", help="Write results JSON here instead of stdout.")
+    parser.add_argument("--baseline", help="Results JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (default 0.2).")
+    args = parser.parse_args(argv)
+
+    repeats = args.repeats or DEFAULT_REPEATS[args.scale]
+    results = run(args.scale, args.queries, args.seed, repeats)
+    payload = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(payload + "\n")
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old:.3f} -> {new:.3f} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot get a concurrency slot in time."""
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds the number of requests doing work at once.
+
+    Up to `limit` requests run concurrently and up to `max_waiting` more queue
+    for a slot. Anything beyond that, or anything that waits longer than
+    `timeout` seconds, is rejected with `Overloaded` so callers can shed load
+    instead of piling up.
+    """
+
+    def __init__(self, limit, max_waiting, timeout):
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        if self.in_flight + self.waiting >= self.limit + self.max_waiting:
+            raise Overloaded("Too many requests are already waiting.")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise Overloaded("Timed out waiting for a free worker.") from None
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+class Session:
+    def __init__(self, session_id, max_turns):
+        self.session_id = session_id
+        self.max_turns = max_turns
+        self.chat_history = []
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    def add_turn(self, question, answer):
+        """Records one question/answer pair, keeping only the last `max_turns` pairs."""
+        self.chat_history.extend([question, answer])
+        del self.chat_history[:max(0, len(self.chat_history) - 2 * self.max_turns)]
+
+
+class SessionStore:
+    """
+    Keeps per-client sessions keyed by ID.
+
+    Sessions idle for longer than `ttl` seconds are dropped, and the least
+    recently used session is evicted once `max_sessions` is reached. Each
+    session keeps at most `max_turns` question/answer pairs of history, since
+    the whole history goes into every prompt.
+    """
+
+    def __init__(self, max_sessions=10_000, ttl=3600, max_turns=10):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self._sessions = OrderedDict()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, session_id):
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session is None:
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+            session = self._sessions[session_id] = Session(session_id, self.max_turns)
+        self._sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        return session
+
+    def delete(self, session_id):
+        return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_used >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+
+
+async def run_blocking(pool, function, *args):
+    """Runs a blocking call on the worker pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, function, *args)
+
+
+async def iterate_blocking(pool, iterator):
+    """Drains a blocking iterator on the worker pool, one item at a time."""
+    done = object()
+    try:
+        while True:
+            item = await run_blocking(pool, next, iterator, done)
+            if item is done:
+                break
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await run_blocking(pool, close)
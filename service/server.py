@@ -0,0 +1,468 @@
+"""
+Headless HTTP service for both apps.
+
+Exposes ingestion, query and streaming-query endpoints backed by the Hands-on
+backend (`backend.main.get_response`) and the analyzer's `ChatEngine`, so the
+apps can be load-tested and called from other services. Run from the
+repository root:
+
+    python -m service.server --port 8080
+
+The Hands-on settings still read GOOGLE_API_KEY from the environment or a
+`.env` file in the working directory. Relative Chroma directories are resolved
+against each app's own folder, so the service opens the same stores as the
+Streamlit apps do.
+
+Pass --hands-on-snapshot / --analyzer-snapshot to start from a snapshot file
+(see `snapshot.cli`) instead of opening Chroma. Snapshots are memory-mapped,
+so startup is near-instant. The first ingest into a snapshot-backed app imports
+the snapshot into that app's Chroma store before adding the new documents, so
+the served data carries over.
+
+Routes:
+    GET    /health
+    POST   /hands-on/ingest                          {"text": "..."}
+    POST   /hands-on/sessions/{session_id}/query     {"question": "...", "model": "...", "rag": true}
+    POST   /hands-on/sessions/{session_id}/query/stream
+    DELETE /hands-on/sessions/{session_id}
+    POST   /analyzer/ingest                          multipart files, or {"text": "...", "source": "..."}
+    POST   /analyzer/query                           {"question": "..."}
+
+Hands-on sessions keep the last --max-history-turns question/answer pairs and
+answer one query at a time; a second query on a busy session gets a 409.
+Requests over --max-concurrency queue for a worker, and get a 503 once
+--max-waiting are queued or after --queue-timeout seconds.
+The analyzer's ChatEngine does not use history, so its queries are stateless.
+"""
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import logging
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+from PyPDF2.errors import PyPdfError
+
+from service.runtime import (
+    ConcurrencyLimiter,
+    Overloaded,
+    SessionStore,
+    iterate_blocking,
+    run_blocking,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HANDS_ON_DIR = os.path.join(REPO_ROOT, "Hands-on")
+ANALYZER_DIR = os.path.join(REPO_ROOT, "market_research_analyzer")
+
+for _path in (HANDS_ON_DIR, ANALYZER_DIR):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+from backend.config import settings  # noqa: E402
+from backend.db_manager import build_vectorstore_from_text, get_embeddings, get_vectorstore  # noqa: E402
+from backend.main import get_response, stream_response  # noqa: E402
+from config import Config  # noqa: E402
+from src.chat_engine import ChatEngine  # noqa: E402
+from src.document_processor import DocumentProcessor  # noqa: E402
+from src.vector_store import VectorStoreManager  # noqa: E402
+
+from snapshot.store import DEFAULT_COLLECTION, SnapshotVectorStore, import_snapshot  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+MODEL_OPTIONS = ["gemini-2.0-flash", "gemini-pro", "gemini-1.5-flash"]
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+class ServiceState:
+    """Everything shared across requests: the worker pool, stores, models and sessions."""
+
+    def __init__(self, workers, max_concurrency, max_waiting, queue_timeout, max_history_turns,
+                 hands_on_snapshot=None, analyzer_snapshot=None):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag-worker")
+        self.limiter = ConcurrencyLimiter(max_concurrency, max_waiting, queue_timeout)
+        self.hands_on_sessions = SessionStore(max_turns=max_history_turns)
+        self.hands_on_store = None
+        self.analyzer_manager = None
+        self.analyzer_engine = None
+        self.hands_on_ingest_lock = asyncio.Lock()
+        self.analyzer_ingest_lock = asyncio.Lock()
+        self.hands_on_snapshot = hands_on_snapshot
+        self.analyzer_snapshot = analyzer_snapshot
+
+
+STATE = web.AppKey("state", ServiceState)
+
+
+def _json_error(error_class, message):
+    return error_class(
+        text=json.dumps({"error": message}),
+        content_type="application/json",
+    )
+
+
+async def _read_json(request):
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise _json_error(web.HTTPBadRequest, "Request body must be valid JSON.")
+    if not isinstance(body, dict):
+        raise _json_error(web.HTTPBadRequest, "Request body must be a JSON object.")
+    return body
+
+
+def _read_question(body):
+    question = body.get("question")
+    if not isinstance(question, str) or not question.strip():
+        raise _json_error(web.HTTPBadRequest, "'question' must be a non-empty string.")
+    return question
+
+
+def _resolve_persist_directories():
+    """Points relative Chroma directories at each app's folder rather than the CWD."""
+    if not os.path.isabs(settings.CHROMA_PERSIST_DIRECTORY):
+        settings.CHROMA_PERSIST_DIRECTORY = os.path.join(HANDS_ON_DIR, settings.CHROMA_PERSIST_DIRECTORY)
+    if not os.path.isabs(Config.PERSIST_DIRECTORY):
+        Config.PERSIST_DIRECTORY = os.path.normpath(os.path.join(ANALYZER_DIR, Config.PERSIST_DIRECTORY))
+
+
+def _load_hands_on(snapshot_path):
+    if snapshot_path:
+        return SnapshotVectorStore.load(snapshot_path, get_embeddings())
+    return get_vectorstore()
+
+
+def _load_analyzer(snapshot_path):
+    manager = VectorStoreManager()
+    engine = None
+    if snapshot_path:
+        vector_store = SnapshotVectorStore.load(snapshot_path, manager.embeddings)
+        engine = ChatEngine(vector_store.as_retriever(search_kwargs={"k": 4}))
+    elif os.path.isdir(manager.persist_directory):
+        engine = ChatEngine(manager.get_retriever())
+    return manager, engine
+
+
+def _process_upload(processor, filename, content):
+    suffix = os.path.splitext(filename)[1].lower()
+    if suffix not in (".pdf", ".csv"):
+        return processor.process_text(content.decode("utf-8"), source=filename)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(content)
+        tmp_path = tmp_file.name
+    try:
+        documents = processor.process_pdf(tmp_path) if suffix == ".pdf" else processor.process_csv(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+    # The processor names chunks after the temp file; keep the uploaded name instead.
+    for document in documents:
+        document.metadata["source"] = filename
+    return documents
+
+
+def _parse_analyzer_documents(uploads, text, source):
+    processor = DocumentProcessor()
+    documents = []
+    for filename, content in uploads:
+        documents.extend(_process_upload(processor, filename, content))
+    if text:
+        documents.extend(processor.process_text(text, source=source))
+    return documents
+
+
+def _index_analyzer_documents(manager, documents):
+    manager.add_documents(documents)
+    return ChatEngine(manager.get_retriever())
+
+
+async def _import_served_snapshot(state, attribute, persist_directory):
+    """
+    Copies the snapshot an app is serving into its Chroma store.
+
+    Ingestion writes to Chroma, so without this the first ingest would swap
+    the served snapshot for whatever the persist directory held before.
+    Runs at most once per app; the caller must hold that app's ingest lock.
+    """
+    snapshot_path = getattr(state, attribute)
+    if not snapshot_path:
+        return
+    try:
+        await run_blocking(state.pool, import_snapshot, snapshot_path, persist_directory, DEFAULT_COLLECTION)
+    except Exception as e:
+        logger.exception("Importing snapshot %s into %s failed", snapshot_path, persist_directory)
+        raise _json_error(web.HTTPInternalServerError, f"Error importing the served snapshot: {str(e)}")
+    setattr(state, attribute, None)
+
+
+@contextlib.asynccontextmanager
+async def _worker_slot(state):
+    """
+    Holds a concurrency slot for the body, or answers 503 with Retry-After.
+
+    Handlers take any per-session or ingest lock before this, so requests
+    queued behind one of those locks never sit on a slot doing no work.
+    """
+    try:
+        async with state.limiter.slot():
+            yield
+    except Overloaded as e:
+        raise web.HTTPServiceUnavailable(
+            text=json.dumps({"error": str(e)}),
+            content_type="application/json",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def health(request):
+    state = request.app[STATE]
+    return web.json_response(
+        {
+            "status": "ok",
+            "in_flight": state.limiter.in_flight,
+            "waiting": state.limiter.waiting,
+            "hands_on_sessions": len(state.hands_on_sessions),
+            "hands_on_store_loaded": state.hands_on_store is not None,
+            "analyzer_documents_loaded": state.analyzer_engine is not None,
+        }
+    )
+
+
+async def hands_on_ingest(request):
+    state = request.app[STATE]
+    body = await _read_json(request)
+    text = body.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise _json_error(web.HTTPBadRequest, "'text' must be a non-empty string.")
+
+    async with state.hands_on_ingest_lock, _worker_slot(state):
+        await _import_served_snapshot(state, "hands_on_snapshot", settings.CHROMA_PERSIST_DIRECTORY)
+        try:
+            vector_store = await run_blocking(state.pool, build_vectorstore_from_text, text)
+        except Exception as e:
+            logger.exception("Hands-on ingest failed")
+            raise _json_error(
+                web.HTTPInternalServerError, f"An error occurred while creating the vector store: {e}"
+            )
+        state.hands_on_store = vector_store
+    return web.json_response({"status": "ingested"})
+
+
+def _read_hands_on_query(state, body):
+    question = _read_question(body)
+    model_name = body.get("model", DEFAULT_MODEL)
+    if model_name not in MODEL_OPTIONS:
+        raise _json_error(web.HTTPBadRequest, f"'model' must be one of {MODEL_OPTIONS}.")
+    rag_enabled = body.get("rag", True)
+    if not isinstance(rag_enabled, bool):
+        raise _json_error(web.HTTPBadRequest, "'rag' must be a JSON boolean.")
+    if rag_enabled and state.hands_on_store is None:
+        raise _json_error(web.HTTPConflict, "No documents ingested yet; ingest text or disable RAG.")
+    return question, model_name, rag_enabled
+
+
+def _claim_session(state, session_id):
+    """
+    Returns an idle session, creating it if needed.
+
+    A session answers one request at a time. A second request while one is
+    running gets a 409 straight away instead of queueing behind it, so one
+    client cannot tie up slots other users need.
+    """
+    session = state.hands_on_sessions.get(session_id)
+    if session.lock.locked():
+        raise _json_error(web.HTTPConflict, "This session is already answering another request.")
+    return session
+
+
+def _hands_on_query_args(state, session, question, model_name, rag_enabled):
+    # Snapshot the history so the worker thread never sees it change underneath it.
+    return question, state.hands_on_store, list(session.chat_history), model_name, rag_enabled
+
+
+async def hands_on_query(request):
+    state = request.app[STATE]
+    body = await _read_json(request)
+    query = _read_hands_on_query(state, body)
+    session = _claim_session(state, request.match_info["session_id"])
+
+    async with session.lock, _worker_slot(state):
+        args = _hands_on_query_args(state, session, *query)
+        answer = await run_blocking(state.pool, get_response, *args)
+        session.add_turn(HumanMessage(content=args[0]), AIMessage(content=answer))
+    return web.json_response({"session_id": session.session_id, "answer": answer})
+
+
+async def hands_on_query_stream(request):
+    state = request.app[STATE]
+    body = await _read_json(request)
+    query = _read_hands_on_query(state, body)
+    session = _claim_session(state, request.match_info["session_id"])
+
+    async with session.lock, _worker_slot(state):
+        args = _hands_on_query_args(state, session, *query)
+        response = web.StreamResponse(headers={"Content-Type": "text/plain; charset=utf-8"})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+
+        pieces = []
+        try:
+            async for piece in iterate_blocking(state.pool, stream_response(*args)):
+                pieces.append(piece)
+                await response.write(piece.encode("utf-8"))
+        except Exception:
+            # Headers are already sent, so the client only sees a truncated body.
+            logger.exception("Streaming query failed for session %s", session.session_id)
+        else:
+            session.add_turn(HumanMessage(content=args[0]), AIMessage(content="".join(pieces)))
+        await response.write_eof()
+    return response
+
+
+async def hands_on_delete_session(request):
+    deleted = request.app[STATE].hands_on_sessions.delete(request.match_info["session_id"])
+    if not deleted:
+        raise _json_error(web.HTTPNotFound, "Unknown session.")
+    return web.json_response({"status": "deleted"})
+
+
+async def analyzer_ingest(request):
+    state = request.app[STATE]
+    uploads = []
+    text, source = None, "api"
+    if request.content_type.startswith("multipart/"):
+        reader = await request.multipart()
+        async for part in reader:
+            if part.filename:
+                uploads.append((part.filename, await part.read()))
+    else:
+        body = await _read_json(request)
+        text, source = body.get("text"), body.get("source", source)
+        if not isinstance(text, str) or not text.strip():
+            raise _json_error(web.HTTPBadRequest, "'text' must be a non-empty string.")
+
+    async with _worker_slot(state):
+        try:
+            documents = await run_blocking(state.pool, _parse_analyzer_documents, uploads, text, source)
+        except (UnicodeDecodeError, csv.Error, PyPdfError) as e:
+            raise _json_error(web.HTTPBadRequest, f"Error processing documents: {str(e)}")
+    if not documents:
+        raise _json_error(web.HTTPBadRequest, "No documents were successfully processed.")
+
+    async with state.analyzer_ingest_lock, _worker_slot(state):
+        await _import_served_snapshot(state, "analyzer_snapshot", state.analyzer_manager.persist_directory)
+        try:
+            engine = await run_blocking(
+                state.pool, _index_analyzer_documents, state.analyzer_manager, documents
+            )
+        except Exception as e:
+            logger.exception("Analyzer ingest failed")
+            raise _json_error(web.HTTPInternalServerError, f"Error indexing documents: {str(e)}")
+        state.analyzer_engine = engine
+    return web.json_response({"status": "ingested", "chunks": len(documents)})
+
+
+async def analyzer_query(request):
+    state = request.app[STATE]
+    body = await _read_json(request)
+    question = _read_question(body)
+    if state.analyzer_engine is None:
+        raise _json_error(web.HTTPConflict, "No documents ingested yet.")
+
+    async with _worker_slot(state):
+        answer = await run_blocking(state.pool, state.analyzer_engine.ask_question, question)
+    return web.json_response({"answer": answer})
+
+
+async def _on_startup(app):
+    state = app[STATE]
+    _resolve_persist_directories()
+    state.hands_on_store = await run_blocking(state.pool, _load_hands_on, state.hands_on_snapshot)
+    state.analyzer_manager, state.analyzer_engine = await run_blocking(
+        state.pool, _load_analyzer, state.analyzer_snapshot
+    )
+
+
+async def _on_cleanup(app):
+    app[STATE].pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_app(workers=64, max_concurrency=64, max_waiting=512, queue_timeout=30.0, max_body_mb=50,
+               max_history_turns=10, hands_on_snapshot=None, analyzer_snapshot=None):
+    """
+    Builds the aiohttp application.
+
+    Args:
+        workers (int): Threads available for blocking LangChain/Chroma calls.
+        max_concurrency (int): Requests allowed to do work at the same time.
+        max_waiting (int): Requests allowed to queue before new ones get a 503.
+        queue_timeout (float): Seconds a request may wait for a slot before a 503.
+        max_body_mb (int): Largest accepted request body, in megabytes.
+        max_history_turns (int): Question/answer pairs kept per Hands-on session.
+        hands_on_snapshot (str): Optional snapshot to serve the Hands-on store from.
+        analyzer_snapshot (str): Optional snapshot to serve the analyzer store from.
+
+    Returns:
+        web.Application: The configured application.
+    """
+    app = web.Application(client_max_size=max_body_mb * 1024 * 1024)
+    app[STATE] = ServiceState(
+        workers, max_concurrency, max_waiting, queue_timeout, max_history_turns,
+        hands_on_snapshot, analyzer_snapshot,
+    )
+    app.on_startup.append(_on_startup)
+    app.on_cleanup.append(_on_cleanup)
+    app.add_routes(
+        [
+            web.get("/health", health),
+            web.post("/hands-on/ingest", hands_on_ingest),
+            web.post("/hands-on/sessions/{session_id}/query", hands_on_query),
+            web.post("/hands-on/sessions/{session_id}/query/stream", hands_on_query_stream),
+            web.delete("/hands-on/sessions/{session_id}", hands_on_delete_session),
+            web.post("/analyzer/ingest", analyzer_ingest),
+            web.post("/analyzer/query", analyzer_query),
+        ]
+    )
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP query service for the RAG apps.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=64, help="Worker threads for blocking calls.")
+    parser.add_argument("--max-concurrency", type=int, default=64, help="Requests processed at once.")
+    parser.add_argument("--max-waiting", type=int, default=512, help="Requests queued before returning 503.")
+    parser.add_argument("--queue-timeout", type=float, default=30.0, help="Seconds to wait for a slot.")
+    parser.add_argument("--max-body-mb", type=int, default=50, help="Largest accepted request body.")
+    parser.add_argument(
+        "--max-history-turns", type=int, default=10, help="Question/answer pairs kept per session."
+    )
+    parser.add_argument("--hands-on-snapshot", help="Serve the Hands-on store from this snapshot file.")
+    parser.add_argument("--analyzer-snapshot", help="Serve the analyzer store from this snapshot file.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app(
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        max_waiting=args.max_waiting,
+        queue_timeout=args.queue_timeout,
+        max_body_mb=args.max_body_mb,
+        max_history_turns=args.max_history_turns,
+        hands_on_snapshot=args.hands_on_snapshot,
+        analyzer_snapshot=args.analyzer_snapshot,
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Export, import and inspect vector store snapshots. Run from the repository root:
+
+    python -m snapshot.cli export /path/to/chroma_db analyzer.ragsnap
+    python -m snapshot.cli import analyzer.ragsnap /path/to/new_chroma_db
+    python -m snapshot.cli info analyzer.ragsnap --chroma /path/to/chroma_db
+
+The Chroma directory is whichever the app persisted to, e.g. `Hands-on/chroma_db`
+once the Hands-on app has ingested something; it must contain chroma.sqlite3.
+
+Each command prints a JSON report. `info` includes the cold-start time: a
+fresh Python process opens the snapshot and runs one SnapshotVectorStore
+search with the snapshot's own metric, using its first stored vector as the
+query so no embedding model is needed. With --chroma it also times a fresh
+process opening that Chroma collection and running the same kind of search,
+for comparison. The OS page cache is not dropped, so files that were just
+written or read will still start faster than on a freshly booted machine.
+
+The cold-start figures are measured inside the fresh process after its
+imports, so they leave out interpreter startup and importing numpy, chromadb
+and LangChain, which usually dominate the time before a real app can answer.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from snapshot.format import Snapshot, SnapshotError
+from snapshot.store import (
+    DEFAULT_COLLECTION,
+    SnapshotVectorStore,
+    export_collection,
+    import_snapshot,
+    open_collection,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_timings(path):
+    """
+    Times opening a snapshot and answering one search against it in this process.
+
+    Import time is not included; see the module docstring.
+    """
+    start = time.perf_counter()
+    vector_store = SnapshotVectorStore.load(path, embedding_function=None)
+    opened = time.perf_counter()
+    snapshot = vector_store.snapshot
+    if snapshot.count:
+        vector_store.similarity_search_by_vector(snapshot.vectors[0], k=4)
+    finished = time.perf_counter()
+    return {
+        "open_ms": (opened - start) * 1000,
+        "first_query_ms": (finished - opened) * 1000,
+        "start_ms": (finished - start) * 1000,
+    }
+
+
+def chroma_start_timings(persist_directory, collection_name=DEFAULT_COLLECTION):
+    """
+    Times opening a Chroma collection and answering one search against it in this process.
+
+    The query is the collection's first stored vector, as in `start_timings`.
+    """
+    start = time.perf_counter()
+    _, collection = open_collection(persist_directory, collection_name)
+    opened = time.perf_counter()
+    first = collection.get(limit=1, include=["embeddings"])["embeddings"]
+    if len(first):
+        collection.query(query_embeddings=[first[0]], n_results=4)
+    finished = time.perf_counter()
+    return {
+        "open_ms": (opened - start) * 1000,
+        "first_query_ms": (finished - opened) * 1000,
+        "start_ms": (finished - start) * 1000,
+    }
+
+
+def _fresh_process_timings(*command):
+    completed = subprocess.run(
+        [sys.executable, "-m", "snapshot.cli", *command],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode:
+        # The child already printed a one-line error; pass it on rather than a traceback.
+        raise SnapshotError(completed.stderr.strip().removeprefix("error: "))
+    timings = json.loads(completed.stdout)
+    return {
+        "cold_open_ms": timings["open_ms"],
+        "cold_first_query_ms": timings["first_query_ms"],
+        "cold_start_ms": timings["start_ms"],
+    }
+
+
+def cold_start(path):
+    """Runs `start_timings` in a fresh interpreter, so nothing is warm in-process."""
+    return _fresh_process_timings("start-timings", os.path.abspath(path))
+
+
+def chroma_cold_start(persist_directory, collection_name=DEFAULT_COLLECTION):
+    """Runs `chroma_start_timings` in a fresh interpreter, so nothing is warm in-process."""
+    return _fresh_process_timings(
+        "chroma-start-timings", os.path.abspath(persist_directory), "--collection", collection_name
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vector store snapshot tool.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Export a Chroma collection to a snapshot.")
+    export_parser.add_argument("persist_directory")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+    export_parser.add_argument("--batch-size", type=int)
+
+    import_parser = commands.add_parser("import", help="Bulk-load a snapshot into a Chroma collection.")
+    import_parser.add_argument("snapshot")
+    import_parser.add_argument("persist_directory")
+    import_parser.add_argument("--collection", help="Defaults to the collection name stored in the snapshot.")
+    import_parser.add_argument("--batch-size", type=int)
+
+    info_parser = commands.add_parser("info", help="Describe a snapshot and time a cold start.")
+    info_parser.add_argument("snapshot")
+    info_parser.add_argument("--chroma", help="Also time a cold start of this Chroma directory.")
+    info_parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+
+    timings_parser = commands.add_parser(
+        "start-timings", help="Time opening and searching a snapshot in this process (used by info)."
+    )
+    timings_parser.add_argument("snapshot")
+
+    chroma_timings_parser = commands.add_parser(
+        "chroma-start-timings", help="Time opening and searching a Chroma collection in this process (used by info)."
+    )
+    chroma_timings_parser.add_argument("persist_directory")
+    chroma_timings_parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+
+    args = parser.parse_args(argv)
+
+    try:
+        report = _run(args)
+    except (SnapshotError, ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def _run(args):
+    if args.command == "export":
+        stats = export_collection(args.persist_directory, args.output, args.collection, args.batch_size)
+        report = {
+            "snapshot": args.output,
+            "count": stats["count"],
+            "dim": stats["dim"],
+            "size_mb": stats["size_bytes"] / (1024 * 1024),
+            "export_s": stats["seconds"],
+        }
+    elif args.command == "import":
+        stats = import_snapshot(args.snapshot, args.persist_directory, args.collection, args.batch_size)
+        report = {
+            "persist_directory": args.persist_directory,
+            "count": stats["count"],
+            "import_s": stats["seconds"],
+            "rows_per_s": stats["count"] / stats["seconds"] if stats["seconds"] else None,
+        }
+    elif args.command == "start-timings":
+        report = start_timings(args.snapshot)
+    elif args.command == "chroma-start-timings":
+        report = chroma_start_timings(args.persist_directory, args.collection)
+    else:
+        # Time the cold start before this process touches the file.
+        timings = cold_start(args.snapshot)
+        snapshot = Snapshot(args.snapshot)
+        report = {
+            "snapshot": args.snapshot,
+            "version": snapshot.header["version"],
+            "collection": snapshot.collection_name,
+            "metric": snapshot.metric,
+            "count": snapshot.count,
+            "dim": snapshot.dim,
+            "size_mb": snapshot.size_bytes / (1024 * 1024),
+            **timings,
+        }
+        if args.chroma:
+            report.update(
+                {f"chroma_{name}": value for name, value in chroma_cold_start(args.chroma, args.collection).items()}
+            )
+    return report
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Single-file, versioned snapshot format for a vector store collection.
+
+Layout (all integers little-endian):
+
+    magic b"RAGSNAP\\0" | uint32 version | padding to 64 bytes
+    sections, each starting on a 64-byte boundary:
+        vectors            float32[count, dim]
+        norms              float32[count]       squared L2 norm of each vector
+        <field>.data       UTF-8 bytes, one entry per row, concatenated
+        <field>.offsets    uint64[count + 1]    entry i is data[offsets[i]:offsets[i + 1]]
+    header             UTF-8 JSON describing the collection and section offsets
+    footer             uint64 header offset | uint64 header length | magic
+
+The string fields are "ids", "texts" and "metadatas" (metadata as JSON).
+Everything is fixed-layout so a reader can memory-map the file and start
+answering queries without parsing or copying the rows up front.
+"""
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b"RAGSNAP\0"
+VERSION = 1
+ALIGNMENT = 64
+STRING_FIELDS = ("ids", "texts", "metadatas")
+
+_PREAMBLE = struct.Struct("<8sI")
+_FOOTER = struct.Struct("<QQ8s")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, truncated or of an unknown version."""
+
+
+def _pad(file):
+    remainder = file.tell() % ALIGNMENT
+    if remainder:
+        file.write(b"\0" * (ALIGNMENT - remainder))
+
+
+def _encode(field, value):
+    if field == "metadatas":
+        return json.dumps(value or None, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return (value or "").encode("utf-8")
+
+
+class SnapshotWriter:
+    """
+    Streams rows into a snapshot file.
+
+    Vectors go straight into the output file while the variable-length
+    string fields are spooled to temporary files, so memory use stays flat
+    no matter how large the collection is. Call `close` to finish the file.
+    """
+
+    def __init__(self, path, dim, collection_name="langchain", collection_metadata=None, metric="l2"):
+        self.path = path
+        self.dim = dim
+        self.count = 0
+        self.collection_name = collection_name
+        self.collection_metadata = collection_metadata
+        self.metric = metric
+        self._file = open(path, "wb")
+        self._file.write(_PREAMBLE.pack(MAGIC, VERSION))
+        _pad(self._file)
+        self._vectors_offset = self._file.tell()
+        self._norms = tempfile.TemporaryFile()
+        self._spools = {field: tempfile.TemporaryFile() for field in STRING_FIELDS}
+        self._offsets = {field: [0] for field in STRING_FIELDS}
+
+    def write(self, ids, vectors, texts, metadatas):
+        vectors = np.ascontiguousarray(vectors, dtype="<f4")
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of shape (n, {self.dim}), got {vectors.shape}.")
+        if not len(ids) == len(texts) == len(metadatas) == len(vectors):
+            raise ValueError("ids, vectors, texts and metadatas must have the same length.")
+
+        self._file.write(vectors.tobytes())
+        self._norms.write(np.einsum("ij,ij->i", vectors, vectors).astype("<f4").tobytes())
+        for field, values in (("ids", ids), ("texts", texts), ("metadatas", metadatas)):
+            spool, offsets = self._spools[field], self._offsets[field]
+            for value in values:
+                encoded = _encode(field, value)
+                spool.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+        self.count += len(vectors)
+
+    def close(self):
+        sections = {"vectors": [self._vectors_offset, self.count * self.dim * 4]}
+        sections["norms"] = self._append(self._norms)
+        for field in STRING_FIELDS:
+            sections[f"{field}.data"] = self._append(self._spools[field])
+            offsets = np.asarray(self._offsets[field], dtype="<u8").tobytes()
+            _pad(self._file)
+            sections[f"{field}.offsets"] = [self._file.tell(), len(offsets)]
+            self._file.write(offsets)
+
+        header = json.dumps(
+            {
+                "format": "ragsnap",
+                "version": VERSION,
+                "count": self.count,
+                "dim": self.dim,
+                "dtype": "float32",
+                "metric": self.metric,
+                "collection": self.collection_name,
+                "collection_metadata": self.collection_metadata,
+                "sections": sections,
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+        header_offset = self._file.tell()
+        self._file.write(header)
+        self._file.write(_FOOTER.pack(header_offset, len(header), MAGIC))
+        self._file.close()
+
+    def _append(self, spool):
+        _pad(self._file)
+        offset = self._file.tell()
+        spool.seek(0)
+        while True:
+            block = spool.read(1 << 20)
+            if not block:
+                break
+            self._file.write(block)
+        size = self._file.tell() - offset
+        spool.close()
+        return [offset, size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.unlink(self.path)
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Opening only reads the footer and JSON header; vectors and strings are
+    paged in by the OS as they are touched.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        size = os.path.getsize(path)
+        if size < _PREAMBLE.size + _FOOTER.size:
+            raise SnapshotError(f"{path} is too small to be a snapshot.")
+
+        with open(path, "rb") as file:
+            magic, version = _PREAMBLE.unpack(file.read(_PREAMBLE.size))
+            file.seek(size - _FOOTER.size)
+            header_offset, header_length, footer_magic = _FOOTER.unpack(file.read(_FOOTER.size))
+            if magic != MAGIC or footer_magic != MAGIC:
+                raise SnapshotError(f"{path} is not a snapshot file or is truncated.")
+            if version != VERSION:
+                raise SnapshotError(f"{path} has snapshot version {version}; this reader supports {VERSION}.")
+            file.seek(header_offset)
+            self.header = json.loads(file.read(header_length).decode("utf-8"))
+
+        self.count = self.header["count"]
+        self.dim = self.header["dim"]
+        self.metric = self.header["metric"]
+        self.collection_name = self.header["collection"]
+        self.collection_metadata = self.header["collection_metadata"]
+        self.size_bytes = size
+
+        self._buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        self.vectors = self._section("vectors", "<f4").reshape(self.count, self.dim)
+        self.norms = self._section("norms", "<f4")
+        self._data = {field: self._section(f"{field}.data", np.uint8) for field in STRING_FIELDS}
+        self._offsets = {field: self._section(f"{field}.offsets", "<u8") for field in STRING_FIELDS}
+
+    def __len__(self):
+        return self.count
+
+    def _section(self, name, dtype):
+        offset, size = self.header["sections"][name]
+        return self._buffer[offset:offset + size].view(dtype)
+
+    def _string(self, field, index):
+        offsets = self._offsets[field]
+        return bytes(self._data[field][offsets[index]:offsets[index + 1]]).decode("utf-8")
+
+    def id(self, index):
+        return self._string("ids", index)
+
+    def text(self, index):
+        return self._string("texts", index)
+
+    def metadata(self, index):
+        return json.loads(self._string("metadatas", index))
+
+    def rows(self, start, stop):
+        """Returns ids, vectors, texts and metadatas for rows [start, stop)."""
+        indices = range(start, min(stop, self.count))
+        return (
+            [self.id(i) for i in indices],
+            self.vectors[start:stop],
+            [self.text(i) for i in indices],
+            [self.metadata(i) for i in indices],
+        )
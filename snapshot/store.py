@@ -0,0 +1,247 @@
+import os
+import time
+
+import chromadb
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from snapshot.format import Snapshot, SnapshotError, SnapshotWriter
+
+# langchain_chroma stores everything in this collection unless told otherwise.
+DEFAULT_COLLECTION = "langchain"
+DEFAULT_BATCH_SIZE = 5000
+
+
+def _max_batch_size(client):
+    get_max_batch_size = getattr(client, "get_max_batch_size", None)
+    return get_max_batch_size() if get_max_batch_size else DEFAULT_BATCH_SIZE
+
+
+def _collection_names(client):
+    # Newer Chroma releases list names; older ones list Collection objects.
+    return {getattr(collection, "name", collection) for collection in client.list_collections()}
+
+
+def open_collection(persist_directory, collection_name=DEFAULT_COLLECTION):
+    """
+    Opens an existing collection in a persisted Chroma directory.
+
+    PersistentClient quietly creates a new, empty database at any path it is
+    given, so the directory and collection are checked first.
+
+    Raises:
+        SnapshotError: If there is no Chroma database or no such collection.
+    """
+    if not os.path.isfile(os.path.join(persist_directory, "chroma.sqlite3")):
+        raise SnapshotError(
+            f"No Chroma database at {persist_directory} (expected chroma.sqlite3 there) "
+            f"to read collection {collection_name!r} from."
+        )
+    client = chromadb.PersistentClient(path=persist_directory)
+    if collection_name not in _collection_names(client):
+        raise SnapshotError(f"Chroma database at {persist_directory} has no collection {collection_name!r}.")
+    return client, client.get_collection(collection_name)
+
+
+def export_collection(persist_directory, output_path, collection_name=DEFAULT_COLLECTION, batch_size=None):
+    """
+    Exports a persisted Chroma collection to a snapshot file.
+
+    Rows are paged out of Chroma in batches, so exporting does not need the
+    whole collection in memory.
+
+    Returns:
+        dict: Row count, dimensions, file size in bytes and elapsed seconds.
+
+    Raises:
+        SnapshotError: If the directory has no Chroma database or collection.
+        ValueError: If the collection is empty.
+    """
+    start = time.perf_counter()
+    client, collection = open_collection(persist_directory, collection_name)
+    batch_size = batch_size or _max_batch_size(client)
+    total = collection.count()
+    metric = (collection.metadata or {}).get("hnsw:space", "l2")
+
+    if not total:
+        raise ValueError(f"Collection {collection_name!r} in {persist_directory} is empty.")
+    dim = len(collection.get(limit=1, include=["embeddings"])["embeddings"][0])
+
+    with SnapshotWriter(output_path, dim, collection_name, collection.metadata, metric) as writer:
+        for offset in range(0, total, batch_size):
+            batch = collection.get(
+                limit=batch_size,
+                offset=offset,
+                include=["embeddings", "documents", "metadatas"],
+            )
+            vectors = np.asarray(batch["embeddings"], dtype=np.float32)
+            writer.write(batch["ids"], vectors, batch["documents"], batch["metadatas"])
+
+    snapshot = Snapshot(output_path)
+    return {
+        "count": snapshot.count,
+        "dim": snapshot.dim,
+        "size_bytes": snapshot.size_bytes,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def import_snapshot(snapshot_path, persist_directory, collection_name=None, batch_size=None):
+    """
+    Bulk-loads a snapshot into a persisted Chroma collection.
+
+    The stored vectors are written as-is, so nothing is re-embedded. Rows
+    whose IDs already exist in the collection are overwritten.
+
+    Returns:
+        dict: Row count and elapsed seconds.
+    """
+    start = time.perf_counter()
+    snapshot = Snapshot(snapshot_path)
+    client = chromadb.PersistentClient(path=persist_directory)
+    collection = client.get_or_create_collection(
+        collection_name or snapshot.collection_name,
+        metadata=snapshot.collection_metadata or None,
+    )
+    batch_size = batch_size or _max_batch_size(client)
+
+    for offset in range(0, snapshot.count, batch_size):
+        ids, vectors, texts, metadatas = snapshot.rows(offset, offset + batch_size)
+        # Chroma rejects empty metadata, so rows without any go in a separate call.
+        with_metadata = [i for i, metadata in enumerate(metadatas) if metadata]
+        without_metadata = [i for i, metadata in enumerate(metadatas) if not metadata]
+        if with_metadata:
+            collection.upsert(
+                ids=[ids[i] for i in with_metadata],
+                embeddings=vectors[with_metadata],
+                documents=[texts[i] for i in with_metadata],
+                metadatas=[metadatas[i] for i in with_metadata],
+            )
+        if without_metadata:
+            collection.upsert(
+                ids=[ids[i] for i in without_metadata],
+                embeddings=vectors[without_metadata],
+                documents=[texts[i] for i in without_metadata],
+            )
+
+    return {"count": snapshot.count, "seconds": time.perf_counter() - start}
+
+
+class SnapshotVectorStore(VectorStore):
+    """
+    Read-only LangChain vector store backed by a memory-mapped snapshot.
+
+    Search is an exact scan over the mapped vectors using the collection's
+    original distance metric, so results match Chroma's ordering without
+    having to build an index at startup. `embedding_function` must be the
+    same model the snapshot was built with; it is only used for queries.
+
+    `filter` supports metadata equality only, e.g. {"source": "report.pdf"};
+    Chroma's operator filters and any other search keyword raise rather than
+    being silently ignored.
+    """
+
+    def __init__(self, snapshot, embedding_function):
+        self.snapshot = snapshot
+        self._embedding_function = embedding_function
+
+    @classmethod
+    def load(cls, path, embedding_function):
+        return cls(Snapshot(path), embedding_function)
+
+    @property
+    def embeddings(self):
+        return self._embedding_function
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        raise NotImplementedError(
+            "Snapshot vector stores are read-only; import the snapshot into Chroma to add documents."
+        )
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+        raise NotImplementedError(
+            "Snapshot vector stores are read-only; build a Chroma store and export it instead."
+        )
+
+    def _distances(self, query):
+        vectors = self.snapshot.vectors
+        query = np.asarray(query, dtype=np.float32)
+        dots = vectors @ query
+        if self.snapshot.metric == "cosine":
+            norms = np.sqrt(self.snapshot.norms) * np.linalg.norm(query)
+            return 1.0 - dots / np.maximum(norms, 1e-12)
+        if self.snapshot.metric == "ip":
+            return 1.0 - dots
+        # Squared L2, which is what Chroma reports for the default "l2" space.
+        return self.snapshot.norms - 2.0 * dots + float(query @ query)
+
+    @staticmethod
+    def _check_search_kwargs(kwargs):
+        unsupported = sorted(set(kwargs) - {"filter"})
+        if unsupported:
+            raise TypeError(f"SnapshotVectorStore does not support search arguments: {unsupported}")
+        metadata_filter = kwargs.get("filter")
+        if metadata_filter is None:
+            return None
+        if not isinstance(metadata_filter, dict):
+            raise TypeError("filter must be a dict of metadata key/value pairs.")
+        for key, value in metadata_filter.items():
+            if key.startswith("$") or not isinstance(value, (str, int, float, bool)):
+                raise ValueError(
+                    f"SnapshotVectorStore only supports metadata equality filters, got {key!r}: {value!r}."
+                )
+        return metadata_filter
+
+    def _matches(self, index, metadata_filter):
+        metadata = self.snapshot.metadata(index) or {}
+        return all(metadata.get(key) == value for key, value in metadata_filter.items())
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, **kwargs):
+        metadata_filter = self._check_search_kwargs(kwargs)
+        if not self.snapshot.count:
+            return []
+        distances = self._distances(embedding)
+        k = min(k, self.snapshot.count)
+        if metadata_filter:
+            # Walk rows nearest-first until k of them match the filter.
+            nearest = []
+            for i in np.argsort(distances):
+                if self._matches(i, metadata_filter):
+                    nearest.append(i)
+                    if len(nearest) == k:
+                        break
+        else:
+            nearest = np.argpartition(distances, k - 1)[:k]
+            nearest = nearest[np.argsort(distances[nearest])]
+        return [
+            (
+                Document(
+                    id=self.snapshot.id(i),
+                    page_content=self.snapshot.text(i),
+                    metadata=self.snapshot.metadata(i) or {},
+                ),
+                float(distances[i]),
+            )
+            for i in nearest
+        ]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        self._check_search_kwargs(kwargs)
+        return self.similarity_search_by_vector_with_score(
+            self._embedding_function.embed_query(query), k, **kwargs
+        )
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        if self.snapshot.metric == "cosine":
+            return self._cosine_relevance_score_fn
+        if self.snapshot.metric == "ip":
+            return self._max_inner_product_relevance_score_fn
+        return self._euclidean_relevance_score_fn
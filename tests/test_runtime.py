@@ -0,0 +1,106 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from service import runtime
+from service.runtime import ConcurrencyLimiter, Overloaded, Session, SessionStore, iterate_blocking
+
+
+def test_limiter_rejects_when_queue_is_full():
+    async def scenario():
+        limiter = ConcurrencyLimiter(limit=1, max_waiting=1, timeout=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        queued = asyncio.create_task(hold())
+        # wait_for hands the acquire to its own task, so let both settle first.
+        while limiter.in_flight != 1:
+            await asyncio.sleep(0)
+        assert limiter.waiting == 1
+
+        with pytest.raises(Overloaded, match="waiting"):
+            async with limiter.slot():
+                pass
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert (limiter.in_flight, limiter.waiting) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_limiter_times_out_waiting_for_a_slot():
+    async def scenario():
+        limiter = ConcurrencyLimiter(limit=1, max_waiting=1, timeout=0.01)
+        async with limiter.slot():
+            with pytest.raises(Overloaded, match="Timed out"):
+                async with limiter.slot():
+                    pass
+            assert limiter.waiting == 0
+        # The slot is free again once the holder leaves.
+        async with limiter.slot():
+            assert limiter.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("max_turns", [0, 1, 3])
+def test_session_keeps_last_turns(max_turns):
+    session = Session("a", max_turns)
+    for i in range(5):
+        session.add_turn(f"q{i}", f"a{i}")
+    expected = [item for i in range(5 - max_turns, 5) for item in (f"q{i}", f"a{i}")]
+    assert session.chat_history == expected
+
+
+def test_session_store_expires_idle_sessions(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(runtime.time, "monotonic", lambda: now[0])
+    store = SessionStore(ttl=60)
+
+    first = store.get("a")
+    assert store.get("a") is first
+    now[0] += 61
+    assert store.get("a") is not first
+    assert len(store) == 1
+
+
+def test_session_store_evicts_least_recently_used():
+    store = SessionStore(max_sessions=2)
+    first = store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")
+
+    assert len(store) == 2
+    assert store.get("a") is first
+    assert not store.delete("b")
+
+
+def test_iterate_blocking_closes_iterator_when_abandoned():
+    closed = []
+
+    def chunks():
+        try:
+            yield from ["one", "two", "three"]
+        finally:
+            closed.append(True)
+
+    async def scenario(pool):
+        stream = iterate_blocking(pool, chunks())
+        assert await stream.__anext__() == "one"
+        await stream.aclose()
+
+    async def drain(pool):
+        return [chunk async for chunk in iterate_blocking(pool, chunks())]
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        asyncio.run(scenario(pool))
+        assert closed == [True]
+        assert asyncio.run(drain(pool)) == ["one", "two", "three"]
+        assert closed == [True, True]
@@ -0,0 +1,168 @@
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+chromadb = pytest.importorskip("chromadb")
+pytest.importorskip("langchain_core")
+
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+from snapshot.format import Snapshot, SnapshotError, SnapshotWriter  # noqa: E402
+from snapshot.store import (  # noqa: E402
+    DEFAULT_COLLECTION,
+    SnapshotVectorStore,
+    export_collection,
+    import_snapshot,
+)
+
+DIM = 8
+ROWS = 40
+
+
+class LookupEmbeddings(Embeddings):
+    """Returns the stored vector for known texts, so queries hit exact rows."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text):
+        return self.vectors[text]
+
+
+def _rows():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((ROWS, DIM)).astype(np.float32)
+    ids = [f"id-{i}" for i in range(ROWS)]
+    texts = [f"chunk {i}" for i in range(ROWS)]
+    # Every third row has no metadata at all.
+    metadatas = [None if i % 3 == 0 else {"source": f"doc-{i % 2}"} for i in range(ROWS)]
+    return ids, vectors, texts, metadatas
+
+
+def _build_chroma(path, metric):
+    ids, vectors, texts, metadatas = _rows()
+    client = chromadb.PersistentClient(path=str(path))
+    collection = client.create_collection(DEFAULT_COLLECTION, metadata={"hnsw:space": metric})
+    with_metadata = [i for i in range(ROWS) if metadatas[i]]
+    without_metadata = [i for i in range(ROWS) if not metadatas[i]]
+    collection.add(
+        ids=[ids[i] for i in with_metadata],
+        embeddings=vectors[with_metadata],
+        documents=[texts[i] for i in with_metadata],
+        metadatas=[metadatas[i] for i in with_metadata],
+    )
+    collection.add(
+        ids=[ids[i] for i in without_metadata],
+        embeddings=vectors[without_metadata],
+        documents=[texts[i] for i in without_metadata],
+    )
+    return collection, dict(zip(texts, vectors.tolist()))
+
+
+@pytest.mark.parametrize("metric", ["l2", "cosine"])
+def test_export_load_search_and_import_round_trip(tmp_path, metric):
+    collection, lookup = _build_chroma(tmp_path / "chroma", metric)
+    snapshot_path = tmp_path / "store.ragsnap"
+
+    stats = export_collection(str(tmp_path / "chroma"), str(snapshot_path), batch_size=7)
+    assert stats["count"] == ROWS
+    assert stats["dim"] == DIM
+
+    vector_store = SnapshotVectorStore.load(str(snapshot_path), LookupEmbeddings(lookup))
+    assert vector_store.snapshot.metric == metric
+
+    query = "chunk 5"
+    expected = collection.query(query_embeddings=[lookup[query]], n_results=4)
+    results = vector_store.similarity_search_with_score(query, k=4)
+    assert [doc.id for doc, _ in results] == expected["ids"][0]
+    assert [score for _, score in results] == pytest.approx(expected["distances"][0], abs=1e-4)
+    assert results[0][0].page_content == query
+
+    stats = import_snapshot(str(snapshot_path), str(tmp_path / "imported"))
+    assert stats["count"] == ROWS
+    imported = chromadb.PersistentClient(path=str(tmp_path / "imported")).get_collection(DEFAULT_COLLECTION)
+    assert imported.metadata["hnsw:space"] == metric
+
+    def by_id(chroma_collection):
+        rows = chroma_collection.get(include=["documents", "metadatas", "embeddings"])
+        return {
+            row_id: (document, metadata, list(embedding))
+            for row_id, document, metadata, embedding in zip(
+                rows["ids"], rows["documents"], rows["metadatas"], rows["embeddings"]
+            )
+        }
+
+    original, copied = by_id(collection), by_id(imported)
+    assert copied.keys() == original.keys()
+    for row_id, (document, metadata, embedding) in original.items():
+        assert copied[row_id][:2] == (document, metadata)
+        np.testing.assert_allclose(copied[row_id][2], embedding, rtol=1e-6)
+
+
+def test_export_rejects_missing_database_and_collection(tmp_path):
+    missing = tmp_path / "missing"
+    with pytest.raises(SnapshotError, match="No Chroma database"):
+        export_collection(str(missing), str(tmp_path / "out.ragsnap"))
+    assert not missing.exists()
+
+    _build_chroma(tmp_path / "chroma", "l2")
+    with pytest.raises(SnapshotError, match="no collection 'other'"):
+        export_collection(str(tmp_path / "chroma"), str(tmp_path / "out.ragsnap"), "other")
+
+
+def test_rows_without_metadata_round_trip(tmp_path):
+    ids, vectors, texts, metadatas = _rows()
+    path = tmp_path / "rows.ragsnap"
+    with SnapshotWriter(str(path), DIM) as writer:
+        writer.write(ids, vectors, texts, metadatas)
+
+    snapshot = Snapshot(str(path))
+    assert len(snapshot) == ROWS
+    assert snapshot.metadata(0) is None
+    assert snapshot.metadata(1) == {"source": "doc-1"}
+    np.testing.assert_array_equal(snapshot.vectors, vectors)
+    np.testing.assert_allclose(snapshot.norms, (vectors ** 2).sum(axis=1), rtol=1e-5)
+
+    vector_store = SnapshotVectorStore(snapshot, embedding_function=None)
+    doc = vector_store.similarity_search_by_vector(vectors[0], k=1)[0]
+    assert doc.id == "id-0"
+    assert doc.metadata == {}
+
+
+def test_metadata_filter_and_unsupported_kwargs(tmp_path):
+    ids, vectors, texts, metadatas = _rows()
+    path = tmp_path / "rows.ragsnap"
+    with SnapshotWriter(str(path), DIM) as writer:
+        writer.write(ids, vectors, texts, metadatas)
+    vector_store = SnapshotVectorStore(Snapshot(str(path)), embedding_function=None)
+
+    docs = vector_store.similarity_search_by_vector(vectors[0], k=5, filter={"source": "doc-1"})
+    assert len(docs) == 5
+    assert all(doc.metadata == {"source": "doc-1"} for doc in docs)
+
+    with pytest.raises(TypeError):
+        vector_store.similarity_search_by_vector(vectors[0], k=1, where={"source": "doc-1"})
+    with pytest.raises(ValueError):
+        vector_store.similarity_search_by_vector(vectors[0], k=1, filter={"$or": []})
+
+
+def test_rejects_truncated_file_and_wrong_version(tmp_path):
+    ids, vectors, texts, metadatas = _rows()
+    path = tmp_path / "rows.ragsnap"
+    with SnapshotWriter(str(path), DIM) as writer:
+        writer.write(ids, vectors, texts, metadatas)
+    data = path.read_bytes()
+
+    truncated = tmp_path / "truncated.ragsnap"
+    truncated.write_bytes(data[: len(data) // 2])
+    with pytest.raises(SnapshotError):
+        Snapshot(str(truncated))
+
+    future = tmp_path / "future.ragsnap"
+    future.write_bytes(data[:8] + struct.pack("<I", 99) + data[12:])
+    with pytest.raises(SnapshotError, match="version 99"):
+        Snapshot(str(future))